@@ -44,6 +44,7 @@ def get_connection():
     db_path = "Data/flights_database.db"
 
     conn = sqlite3.connect(db_path, check_same_thread=False)
+    set_connection_pragmas(conn)
     return conn
 
 if 'conn' not in st.session_state:
@@ -432,13 +433,15 @@ else:
                                             ["Precipitation", "Visibility", "Wind Speed", "Wind Gust"], 
                                             index=0, key="weather chart")
                 
-                fig_dict = {"Precipitation": plot_avg_precip_by_hour(conn, selected_date.month, selected_date.day),
-                            "Visibility": plot_avg_visibility_by_hour(conn, selected_date.month, selected_date.day),
-                            "Wind Speed": plot_avg_wind_speed_by_hour(conn, selected_date.month, selected_date.day),
-                            "Wind Gust": plot_avg_wind_gust_by_hour(conn, selected_date.month, selected_date.day)}
+                # Query the hourly averages once and share them between the charts
+                hourly_stats = compute_hourly_stats(conn, selected_date.month, selected_date.day)
+                fig_dict = {"Precipitation": plot_avg_precip_by_hour(conn, selected_date.month, selected_date.day, hourly_stats),
+                            "Visibility": plot_avg_visibility_by_hour(conn, selected_date.month, selected_date.day, hourly_stats),
+                            "Wind Speed": plot_avg_wind_speed_by_hour(conn, selected_date.month, selected_date.day, hourly_stats),
+                            "Wind Gust": plot_avg_wind_gust_by_hour(conn, selected_date.month, selected_date.day, hourly_stats)}
                 col1, col2 = st.columns(2)
                 with col1:
-                    fig_avg_delay_hour = plot_avg_delay_by_hour(conn, selected_date.month, selected_date.day)
+                    fig_avg_delay_hour = plot_avg_delay_by_hour(conn, selected_date.month, selected_date.day, hourly_stats)
                     st.plotly_chart(fig_avg_delay_hour, use_container_width=True)
                 with col2:
                     if fig_dict[selected_chart]:
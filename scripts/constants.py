@@ -4,7 +4,7 @@ Module that stores global constants used throughout the project.
 """
 
 DATABASE_PATH = "../Data/flights_database.db"  # Path to your SQLite database
-NYC_AIRPORTS = ["JFK", "LGA", "EWR"]   # NYC Airport codes
+NYC_AIRPORTS = frozenset({"JFK", "LGA", "EWR"})   # NYC Airport codes
 
 MISSING_AIRPORTS = [
     ("SJU", "Luis Muñoz Marín International", 18.4360, -66.0058, 9, -4, "N", "America/Puerto_Rico"),
@@ -17,3 +17,10 @@ ERROR_MARGIN_KM = 2.0
 MILES_TO_KM = 1.60934
 R = 6371  # Earth radius in kilometers
 
+# Plotting-related constants
+MAX_SCATTER_POINTS = 50_000  # Above this, scatter plots are binned before plotting
+SCATTER_BINS = 300  # Number of bins per axis used when binning scatter plots
+COORDINATE_DECIMALS = 5  # Decimals kept for plotted coordinates (about 1 m)
+
+# Caching-related constants
+MAX_CACHED_CONNECTIONS = 8  # Connections whose query results are kept in memory (most recently used)
@@ -3,6 +3,7 @@ import timezonefinder
 import plotly.express as px
 import pandas as pd
 from scripts.constants import MISSING_AIRPORTS
+from scripts.db_queries import set_connection_pragmas
 import pytz
 from datetime import datetime, timezone
 
@@ -546,14 +547,20 @@ def create_col_with_speed(conn):
         c.execute("ALTER TABLE planes ADD COLUMN speed REAL")
 
     # Aggiorna la velocità solo per gli aerei con voli validi
+    # (the average speed per plane is computed in one pass over flights, not once per plane)
     c.execute("""
-        UPDATE planes
-        SET speed = (
-            SELECT AVG(distance / (air_time / 60.0))
+        WITH plane_speeds AS (
+            SELECT tailnum, AVG(distance / (air_time / 60.0)) AS speed
             FROM flights
-            WHERE flights.tailnum = planes.tailnum
-              AND air_time > 0
+            WHERE air_time > 0
               AND distance > 0
+            GROUP BY tailnum
+        )
+        UPDATE planes
+        SET speed = (
+            SELECT speed
+            FROM plane_speeds
+            WHERE plane_speeds.tailnum = planes.tailnum
         )
     """)
     
@@ -605,6 +612,27 @@ def create_col_local_arrival_time(conn, recalculate=False):
     conn.commit()
     print("Updated 'local_arrival_time' column in flights table.")
 
+def create_indexes(conn):
+    """Creates the indexes used by the dashboard and plotting queries if they do not exist yet."""
+    try:
+        cursor = conn.cursor()
+        cursor.executescript("""
+            CREATE INDEX IF NOT EXISTS idx_flights_dest ON flights(dest);
+            CREATE INDEX IF NOT EXISTS idx_flights_origin_time_hour ON flights(origin, time_hour);
+            CREATE INDEX IF NOT EXISTS idx_flights_tailnum ON flights(tailnum);
+            CREATE INDEX IF NOT EXISTS idx_flights_carrier_month_day ON flights(carrier, month, day, dep_delay);
+            CREATE INDEX IF NOT EXISTS idx_flights_origin_dest_time_hour ON flights(origin, dest, time_hour, sched_dep_time);
+            CREATE INDEX IF NOT EXISTS idx_weather_origin_time_hour ON weather(origin, time_hour);
+            CREATE INDEX IF NOT EXISTS idx_planes_tailnum ON planes(tailnum);
+            CREATE INDEX IF NOT EXISTS idx_airports_faa ON airports(faa);
+            CREATE INDEX IF NOT EXISTS idx_flights_month_day_dep ON flights(month, day, sched_dep_time, dep_delay);
+            CREATE INDEX IF NOT EXISTS idx_weather_month_day_hour ON weather(month, day, hour, visib, wind_speed, wind_gust, precip);
+        """)
+        conn.commit()
+        print("Indexes checked and created where necessary.")
+    except sqlite3.Error as e:
+        print(f"SQLite error: {e}")
+
 def clean_database(conn):
     """Calls all data cleaning functions."""
     print("Starting database cleaning...")
@@ -622,6 +650,9 @@ def clean_database(conn):
     delete_flights_without_arr_delay(conn)
     check_and_update_flight_times(conn)
 
+    # speed up the queries used by the dashboard
+    create_indexes(conn)
+
     # these are not used in the dashboard and take take a long time to run
     # so we decided not to use them
     
@@ -632,4 +663,7 @@ def clean_database(conn):
 
 if __name__ == "__main__":
     conn = sqlite3.connect("data/flights_database.db")
+    # WAL lets the dashboard read while the database is written; it is stored in the file itself
+    conn.execute("PRAGMA journal_mode = WAL;")
+    set_connection_pragmas(conn)
     clean_database(conn)
\ No newline at end of file
@@ -1,5 +1,43 @@
+import math
+import sqlite3
+import threading
 import pandas as pd
 from pandas import read_sql_query
+from scripts.constants import COORDINATE_DECIMALS, MAX_CACHED_CONNECTIONS
+
+def set_connection_pragmas(conn):
+    """
+    Tunes a connection for the read-heavy dashboard and plotting queries.
+    synchronous=NORMAL avoids an fsync on every commit, and the larger page cache,
+    in-memory temp storage and memory-mapped I/O keep repeated scans of the tables
+    out of the disk. Only per-connection settings are changed; the journal mode is
+    stored in the database file and is left to the explicit setup in data_cleaning.py.
+
+    Parameters:
+    conn (sqlite3.Connection): Database connection, preferably freshly opened.
+    """
+    conn.executescript("""
+        PRAGMA synchronous = NORMAL;
+        PRAGMA cache_size = -200000;
+        PRAGMA temp_store = MEMORY;
+        PRAGMA mmap_size = 268435456;
+    """)
+
+def ensure_math_functions(conn):
+    """
+    Makes sure the SQL math functions used by the plotting queries (sin, radians) exist
+    on a connection. They are built into SQLite 3.35+ when compiled with
+    SQLITE_ENABLE_MATH_FUNCTIONS; on other builds Python fallbacks are registered.
+
+    Parameters:
+    conn (sqlite3.Connection): Database connection.
+    """
+    try:
+        conn.execute("SELECT sin(radians(0));").fetchone()
+    except sqlite3.OperationalError:
+        for name, function in (("sin", math.sin), ("radians", math.radians)):
+            conn.create_function(name, 1, lambda x, function=function: None if x is None else function(x),
+                                 deterministic=True)
 
 def get_flight_destinations_from_airport_on_day(conn, month: int, day: int, airport: str) -> set:
     """
@@ -14,6 +52,33 @@ def get_flight_destinations_from_airport_on_day(conn, month: int, day: int, airp
     cursor.execute(query, (month, day, airport))
     return {row[0] for row in cursor.fetchall()}
 
+def get_destination_flight_counts(conn, origin: str, month: int = None, day: int = None) -> pd.DataFrame:
+    """
+    Counts the flights leaving from a given airport per destination.
+    If both month and day are provided, only the flights on that day are counted.
+
+    Parameters:
+    conn (sqlite3.Connection): Database connection.
+    origin (str): Origin airport code.
+    month (int, optional): Month number to filter flights (1-12).
+    day (int, optional): Day number to filter flights (1-31).
+
+    Returns:
+    pd.DataFrame: DataFrame with columns 'dest' and 'num_flights', sorted by destination.
+    """
+    query = """
+        SELECT dest, COUNT(*) AS num_flights
+        FROM flights
+        WHERE origin = ?
+    """
+    params = [origin]
+    if month is not None and day is not None:
+        query += " AND month = ? AND day = ?"
+        params.extend([month, day])
+    query += " GROUP BY dest ORDER BY dest;"
+
+    return pd.read_sql_query(query, conn, params=tuple(params))
+
 def get_aircraft_info(conn, tailnum):
     """
     Retrieves the manufacturer and model of an aircraft given its tail number (tailnum).
@@ -348,11 +413,8 @@ def get_all_origin_airports(conn):
     Returns:
     list: A sorted list of unique origin airport codes.
     """
-    query = "SELECT DISTINCT origin FROM flights;"
-    cursor = conn.cursor()
-    cursor.execute(query)
-    airports = [row[0] for row in cursor.fetchall()]
-    return sorted(airports)  # Sorted for better usability
+    origins, _ = get_active_airports(conn)
+    return sorted(origins)  # Sorted for better usability
 
 def get_distance_vs_arr_delay(conn, month=None, day=None):
     """
@@ -400,6 +462,100 @@ def get_airports_locations(conn, airport_list=None):
         cursor.execute(query)
     return cursor.fetchall()
 
+# Cached query results per connection, filled on first use by get_airports,
+# get_active_airports and the hourly plots. Only the MAX_CACHED_CONNECTIONS most
+# recently used connections are kept, so the connections of ended dashboard sessions
+# are released. The connection is stored next to its cache so its id cannot be
+# reused while cached.
+_connection_caches = {}
+_connection_caches_lock = threading.Lock()
+
+def get_connection_cache(conn):
+    """
+    Returns the cache dictionary of a connection, creating it on first use, and marks
+    the connection as most recently used. The caches of the least recently used
+    connections are dropped once more than MAX_CACHED_CONNECTIONS are cached.
+
+    Parameters:
+    conn (sqlite3.Connection): Active database connection.
+
+    Returns:
+    dict: Cache dictionary of this connection.
+    """
+    key = id(conn)
+    with _connection_caches_lock:
+        entry = _connection_caches.pop(key, None)
+        if entry is None:
+            entry = (conn, {})
+        _connection_caches[key] = entry  # (re)inserted last = most recently used
+        while len(_connection_caches) > MAX_CACHED_CONNECTIONS:
+            del _connection_caches[next(iter(_connection_caches))]
+    return entry[1]
+
+def get_airports(conn):
+    """
+    Fetches all airports once per connection and keeps them in memory, so plotting
+    functions can look up airports without querying the database again. The airports
+    are fetched again once the database has changed (see get_database_version).
+    Coordinates are rounded to COORDINATE_DECIMALS, which keeps the figure JSON small.
+
+    Parameters:
+    conn (sqlite3.Connection): Active database connection.
+
+    Returns:
+    dict: Dictionary {faa: (name, lat, lon)} with every airport in the airports table.
+    """
+    cache = get_connection_cache(conn)
+    version = get_database_version(conn)
+    cached = cache.get("airports")
+    if cached is None or cached[0] != version:
+        cursor = conn.cursor()
+        cursor.execute("SELECT faa, name, ROUND(lat, ?), ROUND(lon, ?) FROM airports;",
+                       (COORDINATE_DECIMALS, COORDINATE_DECIMALS))
+        cached = (version, {faa: (name, lat, lon) for faa, name, lat, lon in cursor.fetchall()})
+        cache["airports"] = cached
+    return cached[1]
+
+def get_active_airports(conn):
+    """
+    Fetches the airports that appear in the flights table once per connection and
+    keeps them in memory, so repeated calls do not scan the flights table again.
+    They are fetched again once the database has changed (see get_database_version).
+
+    Parameters:
+    conn (sqlite3.Connection): Active database connection.
+
+    Returns:
+    tuple: (origins, destinations) as frozensets of airport codes.
+    """
+    cache = get_connection_cache(conn)
+    version = get_database_version(conn)
+    cached = cache.get("active_airports")
+    if cached is None or cached[0] != version:
+        cursor = conn.cursor()
+        cursor.execute("SELECT DISTINCT origin, dest FROM flights;")
+        routes = cursor.fetchall()
+        origins = frozenset(origin for origin, _ in routes)
+        destinations = frozenset(dest for _, dest in routes)
+        cached = (version, (origins, destinations))
+        cache["active_airports"] = cached
+    return cached[1]
+
+def get_database_version(conn):
+    """
+    Returns a value that changes whenever the database content changes, either through
+    this connection (total_changes) or through another connection (PRAGMA data_version).
+    Used to decide whether cached results for this connection are still valid.
+
+    Parameters:
+    conn (sqlite3.Connection): Active database connection.
+
+    Returns:
+    tuple: (data_version, total_changes)
+    """
+    data_version = conn.execute("PRAGMA data_version;").fetchone()[0]
+    return data_version, conn.total_changes
+
 def get_ny_origin_airports(conn):
     """
     Identifies all different airports in NYC and saves a dataframe.
@@ -88,7 +88,7 @@ def compare_nyc_airports(
     csv_df = file_opener(csv_path)
     results = {}
 
-    for code in NYC_AIRPORTS:
+    for code in sorted(NYC_AIRPORTS):
         df_bad = check_distances_for_code(conn, csv_df, code, error_margin_km)
         if df_bad.empty:
             print(f"All distances for {code} are within the error margin.")
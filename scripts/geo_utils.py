@@ -63,20 +63,38 @@ def create_flight_direction_mapping_table(conn):
     # Create (or replace) the flight_direction_map table in the database.
     mapping_df.to_sql("flight_direction_map", conn, if_exists="replace", index=False)
 
+    # Replacing the table drops its indexes, so (re)create the one used by the joins on it
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_fdm_origin_dest ON flight_direction_map(origin, dest);")
+    conn.commit()
+
+def ensure_flight_direction_mapping_table(conn):
+    """
+    Creates the 'flight_direction_map' table if it does not exist yet.
+    """
+    cursor = conn.cursor()
+    cursor.execute("SELECT name FROM sqlite_master WHERE type='table' AND name='flight_direction_map';")
+    if cursor.fetchone() is None:
+        print("flight_direction_map table not found. Creating it...")
+        create_flight_direction_mapping_table(conn)
+
 def compute_wind_impact(flight_direction, wind_direction, wind_speed):
     """
     Computes the impact of wind on the flight by considering both wind direction and wind speed.
 
+    Works on single values as well as on NumPy arrays or pandas Series, so a whole
+    column of flights can be processed at once. Missing values result in NaN.
+
     Parameters:
-    flight_direction (float): Flight direction in degrees.
-    wind_direction (float): Wind direction in degrees.
-    wind_speed (float): Wind speed in knots.
+    flight_direction (float or array-like): Flight direction in degrees.
+    wind_direction (float or array-like): Wind direction in degrees.
+    wind_speed (float or array-like): Wind speed in knots.
 
     Returns:
-    float: Adjusted wind impact value.
+    float or numpy.ndarray: Adjusted wind impact value(s).
     """
-    if pd.isna(flight_direction) or pd.isna(wind_direction) or pd.isna(wind_speed):
-        return None  # Handle missing values
+    flight_direction = np.asarray(flight_direction, dtype=float)
+    wind_direction = np.asarray(wind_direction, dtype=float)
+    wind_speed = np.asarray(wind_speed, dtype=float)
 
     angle_difference = np.radians(flight_direction - wind_direction)
     return np.cos(angle_difference) * wind_speed  # Multiply by wind speed
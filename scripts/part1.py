@@ -60,7 +60,7 @@ def map_of_inside_vs_outside_US(df_airports: pd.DataFrame) -> None:
 
 #This takes a list of FAA codes and plots lines from them to the home base, default=JFK.
 def plot_FAA(df_airports: pd.DataFrame, FAA_codes: list, home_base_faa: str = "JFK") -> None:
-    fig = go.Figure()
+    traces = []
     
     home_base_data = df_airports[df_airports["faa"] == home_base_faa]
     home_base_name, home_base_lat, home_base_lon = map(str, home_base_data.iloc[0][["name", "lat", "lon"]])
@@ -83,7 +83,7 @@ def plot_FAA(df_airports: pd.DataFrame, FAA_codes: list, home_base_faa: str = "J
         destination_names.append(f"{airport_name} ({FAA_code})")
 
         # Add flight path (lines) from home base to destinations
-        fig.add_trace(go.Scattergeo(
+        traces.append(go.Scattergeo(
             lon=[airport_lon, home_base_lon],
             lat=[airport_lat, home_base_lat],
             mode='lines',
@@ -98,7 +98,7 @@ def plot_FAA(df_airports: pd.DataFrame, FAA_codes: list, home_base_faa: str = "J
     destination_faa_legend = f"Destinations ({destination_faa_list})"
 
     # Add a single trace for all destination markers (red)
-    fig.add_trace(go.Scattergeo(
+    traces.append(go.Scattergeo(
         lon=destination_lons,
         lat=destination_lats,
         hoverinfo='text',
@@ -109,7 +109,7 @@ def plot_FAA(df_airports: pd.DataFrame, FAA_codes: list, home_base_faa: str = "J
     ))
 
     # Add home base marker (blue)
-    fig.add_trace(go.Scattergeo(
+    traces.append(go.Scattergeo(
         lon=[home_base_lon],
         lat=[home_base_lat],
         hoverinfo='text',
@@ -121,13 +121,17 @@ def plot_FAA(df_airports: pd.DataFrame, FAA_codes: list, home_base_faa: str = "J
 
     map_scope = "world" if has_international else "usa"
 
-    fig.update_layout(
-        title_text=f'Flights from airports to {home_base_name}',
-        geo=dict(
-            scope=map_scope,
-            projection_type="natural earth" if map_scope == "world" else None,  
-            showland=True,
-            landcolor="rgb(243, 243, 243)"
+    # Create the figure with all traces and the layout in one step
+    fig = go.Figure(
+        data=traces,
+        layout=dict(
+            title_text=f'Flights from airports to {home_base_name}',
+            geo=dict(
+                scope=map_scope,
+                projection_type="natural earth" if map_scope == "world" else None,  
+                showland=True,
+                landcolor="rgb(243, 243, 243)"
+            )
         )
     )
 
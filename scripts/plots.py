@@ -11,14 +11,55 @@ Includes:
 
 import plotly.graph_objects as go
 import plotly.express as px
-from scripts.db_queries import get_flight_destinations_from_airport_on_day, get_distance_vs_arr_delay
-from scripts.geo_utils import create_flight_direction_mapping_table, compute_wind_impact
-from scripts.constants import NYC_AIRPORTS
+from scripts.db_queries import get_destination_flight_counts, get_distance_vs_arr_delay, get_airports, get_active_airports, get_database_version, get_connection_cache, ensure_math_functions
+from scripts.geo_utils import ensure_flight_direction_mapping_table, compute_wind_impact
+from scripts.constants import NYC_AIRPORTS, MAX_SCATTER_POINTS, SCATTER_BINS
 from plotly.subplots import make_subplots
 import pandas as pd
 import numpy as np
 import sqlite3 as sql
-from math import sin, radians
+
+# Shared geo layout of the world maps, built once instead of on every plot call
+_GEO_LAYOUT = dict(scope="world", showland=True, landcolor="rgb(243, 243, 243)")
+
+def build_flight_paths(home_lon, home_lat, dest_lons, dest_lats):
+    """
+    Builds the line coordinates for flight paths from one home base to many destinations.
+    Every path is stored as (home base, destination, NaN), where the NaN breaks the line
+    so all paths can be drawn with a single Scattergeo trace.
+
+    Parameters:
+        home_lon, home_lat (float): Coordinates of the home base airport.
+        dest_lons, dest_lats (array-like): Coordinates of the destination airports.
+
+    Returns:
+        tuple: (lons, lats) as NumPy arrays of length 3 * number of destinations.
+    """
+    dest_lons = np.asarray(dest_lons, dtype=float)
+    dest_lats = np.asarray(dest_lats, dtype=float)
+
+    lons = np.empty(3 * len(dest_lons))
+    lats = np.empty(3 * len(dest_lats))
+    lons[0::3], lons[1::3], lons[2::3] = home_lon, dest_lons, np.nan
+    lats[0::3], lats[1::3], lats[2::3] = home_lat, dest_lats, np.nan
+    return lons, lats
+
+def scale_marker_sizes(values, min_size=4, max_size=12):
+    """
+    Scales marker sizes with the square root of the given values, so the marker
+    area grows linearly with the value.
+
+    Parameters:
+        values (array-like): Non-negative values, e.g. number of flights.
+        min_size, max_size (float): Marker size for a value of 0 and for the largest value.
+
+    Returns:
+        numpy.ndarray: Marker sizes between min_size and max_size.
+    """
+    values = np.asarray(values, dtype=float)
+    if len(values) == 0 or values.max() <= 0:
+        return np.full(len(values), float(min_size))
+    return min_size + (max_size - min_size) * np.sqrt(values / values.max())
 
 def plot_route_map(conn, origin, destination):
     """
@@ -32,22 +73,19 @@ def plot_route_map(conn, origin, destination):
     Returns:
     plotly Figure: Map with flight route.
     """
-    cursor = conn.cursor()
-    cursor.execute("SELECT lat, lon, faa FROM airports WHERE faa = ?", (origin,))
-    origin_data = cursor.fetchone()
-    
-    cursor.execute("SELECT lat, lon, faa FROM airports WHERE faa = ?", (destination,))
-    destination_data = cursor.fetchone()
+    airports = get_airports(conn)
 
-    if not origin_data or not destination_data:
+    if origin not in airports or destination not in airports:
         return None  # One of the airports is missing
 
-    fig = go.Figure()
-    fig.add_trace(go.Scattergeo(lon=[origin_data[1], destination_data[1]],
-                                lat=[origin_data[0], destination_data[0]],
-                                mode="lines",
-                                line=dict(width=2, color="red"),
-                                hovertext=[f"Origin: {origin_data[2]}", f"Destination: {destination_data[2]}"]))
+    _, origin_lat, origin_lon = airports[origin]
+    _, destination_lat, destination_lon = airports[destination]
+
+    fig = go.Figure(go.Scattergeo(lon=[origin_lon, destination_lon],
+                                  lat=[origin_lat, destination_lat],
+                                  mode="lines",
+                                  line=dict(width=2, color="red"),
+                                  hovertext=[f"Origin: {origin}", f"Destination: {destination}"]))
 
     return fig
 
@@ -70,86 +108,63 @@ def plot_all_destinations_from_NYC_airport(conn, NYC_airport: str):
         print(f"Error: '{NYC_airport}' is not recognized as a NYC airport.")
         return None, []
 
-    # Retrieve all unique destinations for this airport (no date filter)
-    cursor = conn.cursor()
-    cursor.execute("SELECT DISTINCT dest FROM flights WHERE origin = ?", (NYC_airport,))
-    results = cursor.fetchall()
-    FAA_codes = [row[0] for row in results]
+    airports = get_airports(conn)
 
     # Get info for the home base airport
-    cursor.execute("SELECT name, lat, lon FROM airports WHERE faa = ?", (NYC_airport,))
-    home_base_data = cursor.fetchone()
-
-    if not home_base_data:
+    if NYC_airport not in airports:
         print(f"Error: Home base '{NYC_airport}' not found in the database.")
         return None, []
 
-    home_base_name, home_base_lat, home_base_lon = home_base_data
-
-    # Prepare lists for plotting
-    lons, lats = [], []
-    dest_lons, dest_lats, dest_names = [], [], []
-    missing_airports = []
+    home_base_name, home_base_lat, home_base_lon = airports[NYC_airport]
 
-    # For each destination, gather data and plot lines
-    for code in FAA_codes:
-        cursor.execute("SELECT name, lat, lon FROM airports WHERE faa = ?", (code,))
-        airport_data = cursor.fetchone()
-        if not airport_data:
-            missing_airports.append(code)
-            continue
+    # Retrieve all destinations for this airport with their number of flights (no date filter)
+    dest_counts = get_destination_flight_counts(conn, NYC_airport)
 
-        airport_name, airport_lat, airport_lon = airport_data
-        dest_lons.append(airport_lon)
-        dest_lats.append(airport_lat)
-        dest_names.append(f"{airport_name} ({code})")
+    missing_airports = [code for code in dest_counts["dest"] if code not in airports]
+    destinations = [(code, *airports[code], num_flights)
+                    for code, num_flights in zip(dest_counts["dest"], dest_counts["num_flights"])
+                    if code in airports]
 
-        # Build the line path (home base -> destination -> None for break)
-        lons.extend([home_base_lon, airport_lon, None])
-        lats.extend([home_base_lat, airport_lat, None])
+    dest_lons = np.array([lon for _, _, _, lon, _ in destinations], dtype=float)
+    dest_lats = np.array([lat for _, _, lat, _, _ in destinations], dtype=float)
+    dest_names = [f"{name} ({code}): {num_flights} flights" for code, name, _, _, num_flights in destinations]
+    dest_sizes = scale_marker_sizes([num_flights for *_, num_flights in destinations])
 
-    # Create the figure
-    fig = go.Figure()
+    # Build the line paths (home base -> destination -> NaN for break)
+    lons, lats = build_flight_paths(home_base_lon, home_base_lat, dest_lons, dest_lats)
 
     # Flight paths
-    fig.add_trace(go.Scattergeo(
+    line_trace = go.Scattergeo(
         lon=lons,
         lat=lats,
         mode='lines',
         line=dict(width=1, color='black'),
         opacity=0.7,
+        hoverinfo='skip',  # Hover is served by the markers; skip hit-testing the paths
         showlegend=False
-    ))
-
-    # Destination markers
-    fig.add_trace(go.Scattergeo(
-        lon=dest_lons,
-        lat=dest_lats,
-        text=dest_names,
-        hoverinfo='text',
-        mode='markers',
-        name='Destinations',
-        marker=dict(size=6, color='red', opacity=0.85)
-    ))
+    )
 
-    # Home base marker
-    fig.add_trace(go.Scattergeo(
-        lon=[home_base_lon],
-        lat=[home_base_lat],
-        text=[home_base_name],
+    # Destination and home base markers in a single trace (home base last, drawn on top)
+    marker_trace = go.Scattergeo(
+        lon=np.append(dest_lons, home_base_lon),
+        lat=np.append(dest_lats, home_base_lat),
+        text=dest_names + [home_base_name],
         hoverinfo='text',
         mode='markers',
-        name='Home Base',
-        marker=dict(size=10, color='blue')
-    ))
+        showlegend=False,
+        marker=dict(
+            size=np.append(dest_sizes, 10),
+            color=['red'] * len(dest_names) + ['blue'],
+            opacity=[0.85] * len(dest_names) + [1.0]
+        )
+    )
 
-    # Layout settings
-    fig.update_layout(
-        title_text=f'All Flights Departing from {home_base_name} ({NYC_airport})',
-        geo=dict(
-            scope="world",
-            showland=True,
-            landcolor="rgb(243, 243, 243)"
+    # Create the figure with all traces and the layout in one step
+    fig = go.Figure(
+        data=[line_trace, marker_trace],
+        layout=dict(
+            title_text=f'All Flights Departing from {home_base_name} ({NYC_airport})',
+            geo=_GEO_LAYOUT
         )
     )
 
@@ -165,74 +180,66 @@ def plot_destinations_on_day_from_NYC_airport(conn,month: int, day: int, NYC_air
         print(f"Error: '{NYC_airport}' is not recognized as a NYC airport.")
         return None, []
 
-    # Retrieve destination codes from the DB
-    FAA_codes = get_flight_destinations_from_airport_on_day(conn, month, day, NYC_airport)
-    cursor = conn.cursor()
-    cursor.execute("SELECT name, lat, lon FROM airports WHERE faa = ?", (NYC_airport,))
-    home_base_data = cursor.fetchone()
+    # Retrieve destinations on this day with their number of flights from the DB
+    dest_counts = get_destination_flight_counts(conn, NYC_airport, month, day)
+    if dest_counts.empty:
+        print(f"No flights departing from '{NYC_airport}' on {month}/{day}.")
+        return None, []
+
+    airports = get_airports(conn)
 
-    if not home_base_data:
+    if NYC_airport not in airports:
         print(f"Error: Home base '{NYC_airport}' not found in the database.")
         return None, []
 
-    home_base_name, home_base_lat, home_base_lon = home_base_data
-    lons, lats, dest_lons, dest_lats, dest_names = [], [], [], [], []
-    missing_airports = []
-    fig = go.Figure()
-
-    # For each destination, gather data and plot lines
-    for code in FAA_codes:
-        cursor.execute("SELECT name, lat, lon FROM airports WHERE faa = ?", (code,))
-        airport_data = cursor.fetchone()
-        if not airport_data:
-            missing_airports.append(code)
-            continue
-        airport_name, airport_lat, airport_lon = airport_data
-        dest_lons.append(airport_lon)
-        dest_lats.append(airport_lat)
-        dest_names.append(f"{airport_name} ({code})")
-
-        lons.extend([home_base_lon, airport_lon, None])
-        lats.extend([home_base_lat, airport_lat, None])
+    home_base_name, home_base_lat, home_base_lon = airports[NYC_airport]
+
+    # Look up all destination airports in the cached airports table
+    missing_airports = [code for code in dest_counts["dest"] if code not in airports]
+    destinations = [(code, *airports[code], num_flights)
+                    for code, num_flights in zip(dest_counts["dest"], dest_counts["num_flights"])
+                    if code in airports]
+
+    dest_lons = np.array([lon for _, _, _, lon, _ in destinations], dtype=float)
+    dest_lats = np.array([lat for _, _, lat, _, _ in destinations], dtype=float)
+    dest_names = [f"{name} ({code}): {num_flights} flights" for code, name, _, _, num_flights in destinations]
+    dest_sizes = scale_marker_sizes([num_flights for *_, num_flights in destinations])
+
+    # Build the line paths (home base -> destination -> NaN for break)
+    lons, lats = build_flight_paths(home_base_lon, home_base_lat, dest_lons, dest_lats)
 
     # Flight paths
-    fig.add_trace(go.Scattergeo(
+    line_trace = go.Scattergeo(
         lon=lons,
         lat=lats,
         mode='lines',
         line=dict(width=1, color='black'),
         opacity=0.7,
+        hoverinfo='skip',  # Hover is served by the markers; skip hit-testing the paths
         showlegend=False
-    ))
-
-    # Destination markers
-    fig.add_trace(go.Scattergeo(
-        lon=dest_lons,
-        lat=dest_lats,
-        text=dest_names,
-        hoverinfo='text',
-        mode='markers',
-        name='Destinations',
-        marker=dict(size=6, color='red', opacity=0.85)
-    ))
+    )
 
-    # Home base marker
-    fig.add_trace(go.Scattergeo(
-        lon=[home_base_lon],
-        lat=[home_base_lat],
-        text=[home_base_name],
+    # Destination and home base markers in a single trace (home base last, drawn on top)
+    marker_trace = go.Scattergeo(
+        lon=np.append(dest_lons, home_base_lon),
+        lat=np.append(dest_lats, home_base_lat),
+        text=dest_names + [home_base_name],
         hoverinfo='text',
         mode='markers',
-        name='Home Base',
-        marker=dict(size=10, color='blue')
-    ))
+        showlegend=False,
+        marker=dict(
+            size=np.append(dest_sizes, 10),
+            color=['red'] * len(dest_names) + ['blue'],
+            opacity=[0.85] * len(dest_names) + [1.0]
+        )
+    )
 
-    fig.update_layout(
-        title_text=f'Flights from {home_base_name} on {month}/{day}',
-        geo=dict(
-            scope="world",
-            showland=True,
-            landcolor="rgb(243, 243, 243)"
+    # Create the figure with all traces and the layout in one step
+    fig = go.Figure(
+        data=[line_trace, marker_trace],
+        layout=dict(
+            title_text=f'Flights from {home_base_name} on {month}/{day}',
+            geo=_GEO_LAYOUT
         )
     )
     return fig, missing_airports
@@ -249,41 +256,27 @@ def plot_airports_with_and_without_flights(conn):
     Returns:
         go.Figure: A Plotly figure object containing the visualization.
     """
-    cursor = conn.cursor()
-    
-    # Query for airports with neither incoming nor outgoing flights
-    query_no_flights = """
-        SELECT faa, name, lat, lon FROM airports
-        WHERE faa NOT IN (SELECT DISTINCT dest FROM flights)
-        AND faa NOT IN (SELECT DISTINCT origin FROM flights);
-    """
-    cursor.execute(query_no_flights)
-    missing_airports = cursor.fetchall()
-    
-    # Query for airports that have at least one incoming or outgoing flight
-    query_with_flights = """
-        SELECT faa, name, lat, lon FROM airports
-        WHERE faa IN (SELECT DISTINCT dest FROM flights)
-        OR faa IN (SELECT DISTINCT origin FROM flights);
-    """
-    cursor.execute(query_with_flights)
-    active_airports = cursor.fetchall()
+    # All airports that have any incoming or outgoing flight
+    origins, destinations = get_active_airports(conn)
+    active_codes = origins | destinations
 
-    fig = go.Figure()
+    airports_df = (pd.DataFrame.from_dict(get_airports(conn), orient="index", columns=["name", "lat", "lon"])
+                   .rename_axis("faa").reset_index())
+    airports_df["label"] = airports_df["name"] + " (" + airports_df["faa"] + ")"
+
+    has_flights = airports_df["faa"].isin(active_codes)
+    missing_airports = airports_df[~has_flights]
+    active_airports = airports_df[has_flights]
+
+    traces = []
 
     # Airports with no flights (red)
-    if missing_airports:
-        no_flight_lons, no_flight_lats, no_flight_names = [], [], []
-        for faa, name, lat, lon in missing_airports:
-            no_flight_lons.append(lon)
-            no_flight_lats.append(lat)
-            no_flight_names.append(f"{name} ({faa})")
-
-        fig.add_trace(go.Scattergeo(
-            lon=no_flight_lons,
-            lat=no_flight_lats,
+    if not missing_airports.empty:
+        traces.append(go.Scattergeo(
+            lon=missing_airports["lon"].to_numpy(),
+            lat=missing_airports["lat"].to_numpy(),
             hoverinfo='text',
-            text=no_flight_names,
+            text=missing_airports["label"].tolist(),
             mode='markers',
             name='Airports with No Flights',
             marker=dict(size=6, color='red', opacity=0.75)
@@ -292,31 +285,25 @@ def plot_airports_with_and_without_flights(conn):
         print("All airports have at least one flight.")
     
     # Add airports with flights (blue)
-    if active_airports:
-        flight_lons, flight_lats, flight_names = [], [], []
-        for faa, name, lat, lon in active_airports:
-            flight_lons.append(lon)
-            flight_lats.append(lat)
-            flight_names.append(f"{name} ({faa})")
-
-        fig.add_trace(go.Scattergeo(
-            lon=flight_lons,
-            lat=flight_lats,
+    if not active_airports.empty:
+        traces.append(go.Scattergeo(
+            lon=active_airports["lon"].to_numpy(),
+            lat=active_airports["lat"].to_numpy(),
             hoverinfo='text',
-            text=flight_names,
+            text=active_airports["label"].tolist(),
             mode='markers',
             name='Airports with Flights',
             marker=dict(size=6, color='blue', opacity=0.75)
         ))
     else:
         print("No airports have flights.")
-    
-    fig.update_layout(
-        title_text='Airports With and Without Any Flights',
-        geo=dict(
-            scope="world",
-            showland=True,
-            landcolor="rgb(243, 243, 243)"
+
+    # Create the figure with all traces and the layout in one step
+    fig = go.Figure(
+        data=traces,
+        layout=dict(
+            title_text='Airports With and Without Any Flights',
+            geo=_GEO_LAYOUT
         )
     )
     return fig
@@ -327,6 +314,9 @@ def plot_distance_vs_arr_delay(conn, plot_type="scatter", month=None, day=None):
     between these two variables.
     
     If both month and day are provided, the function filters the flights to only that day.
+    When the scatter plot would contain more than MAX_SCATTER_POINTS flights, the points
+    are binned into a SCATTER_BINS x SCATTER_BINS grid and one marker per non-empty bin
+    is drawn, sized by the number of flights in it.
     
     Parameters:
         conn (sqlite3.Connection): Active database connection.
@@ -340,30 +330,72 @@ def plot_distance_vs_arr_delay(conn, plot_type="scatter", month=None, day=None):
     # Use the updated function to get the data (filtered if month and day are provided)
     distance_vs_arr_df = get_distance_vs_arr_delay(conn, month, day)
     
+    # Skip pairs with missing values, so the correlation and both binned plots use the same flights
+    distances = distance_vs_arr_df["distance"].to_numpy(dtype=float)
+    arr_delays = distance_vs_arr_df["arr_delay"].to_numpy(dtype=float)
+    valid = ~(np.isnan(distances) | np.isnan(arr_delays))
+    distances, arr_delays = distances[valid], arr_delays[valid]
+
     # Calculate correlation between distance and arrival delay
-    correlation = distance_vs_arr_df["distance"].corr(distance_vs_arr_df["arr_delay"])
-    
-    if plot_type == "scatter":
+    if len(distances) > 1:
+        correlation = float(np.corrcoef(distances, arr_delays)[0, 1])
+    else:
+        correlation = np.nan
+    labels = {"distance": "Distance (miles)", "arr_delay": "Arrival Delay (minutes)"}
+
+    if plot_type == "scatter" and len(distances) > MAX_SCATTER_POINTS:
+        # Coalesce overlapping points into bins so only one marker per bin is sent to the browser
+        counts, x_edges, y_edges = np.histogram2d(distances, arr_delays, bins=SCATTER_BINS)
+        x_idx, y_idx = np.nonzero(counts)
+        bin_counts = counts[x_idx, y_idx]
+        x_centers = (x_edges[:-1] + x_edges[1:]) / 2
+        y_centers = (y_edges[:-1] + y_edges[1:]) / 2
+
+        fig = go.Figure(go.Scattergl(
+            x=x_centers[x_idx],
+            y=y_centers[y_idx],
+            mode="markers",
+            customdata=bin_counts,
+            hovertemplate="Distance: %{x:.0f}<br>Arrival Delay: %{y:.0f}<br>Flights: %{customdata:.0f}<extra></extra>",
+            marker=dict(size=3 + 12 * np.sqrt(bin_counts / bin_counts.max()), opacity=0.5)
+        ))
+        fig.update_layout(
+            title_text="Flight Distance vs Arrival Delay",
+            xaxis_title=labels["distance"],
+            yaxis_title=labels["arr_delay"]
+        )
+        # Add a reference line at 0 delay
+        fig.add_hline(y=0, line_dash="dash", line_color="red")
+    elif plot_type == "scatter":
         fig = px.scatter(
             distance_vs_arr_df,
             x="distance",
             y="arr_delay",
             title="Flight Distance vs Arrival Delay",
-            labels={"distance": "Distance (miles)", "arr_delay": "Arrival Delay (minutes)"},
-            opacity=0.5
+            labels=labels,
+            opacity=0.5,
+            render_mode="webgl"  # WebGL keeps hundreds of thousands of points responsive
         )
         # Add a reference line at 0 delay
         fig.add_hline(y=0, line_dash="dash", line_color="red")
     elif plot_type == "histogram":
-        fig = px.histogram(
-            distance_vs_arr_df,
-            x="distance",
-            y="arr_delay",
-            title="Flight Distance vs Arrival Delay",
-            labels={"distance": "Distance (miles)", "arr_delay": "Arrival Delay (minutes)"},
-            nbins=50,
-            opacity=0.75,
-            histfunc="avg"
+        # Average arrival delay per distance bin, computed here so only the bins are sent to Plotly
+        delay_sums, edges = np.histogram(distances, bins=50, weights=arr_delays)
+        flight_counts, _ = np.histogram(distances, bins=edges)
+        with np.errstate(invalid="ignore", divide="ignore"):
+            avg_delays = delay_sums / flight_counts
+
+        fig = go.Figure(go.Bar(
+            x=(edges[:-1] + edges[1:]) / 2,
+            y=avg_delays,
+            width=np.diff(edges),
+            opacity=0.75
+        ))
+        fig.update_layout(
+            title_text="Flight Distance vs Arrival Delay",
+            xaxis_title=labels["distance"],
+            yaxis_title=f"Average {labels['arr_delay']}",
+            bargap=0
         )
     else:
         raise ValueError("Invalid plot_type. Choose either 'scatter' or 'histogram'.")
@@ -374,13 +406,19 @@ def multi_distance_distribution_gen(conn,*args):
     """
     Creates multiple histogram subplots in a single figure.
     Each item in *args should be a tuple: (df, title, column_name).
+    The histograms are binned with NumPy (30 bins) and drawn as bar charts.
 
     Example usage:
-    multi_distance_distribution_gen(
+    fig = multi_distance_distribution_gen(
+        conn,
         (df_1, "Title 1", "distance"),
         (df_2, "Title 2", "distance"),
         ...
     )
+    fig.show()
+
+    Returns:
+    plotly.graph_objects.Figure: Figure with one histogram subplot per DataFrame.
     """
     num_graphs = len(args)
     if num_graphs == 0:
@@ -398,6 +436,7 @@ def multi_distance_distribution_gen(conn,*args):
 
     colors = ["blue", "green", "red", "purple", "orange", "cyan", "magenta", "yellow"]
     color_index = 0
+    traces, trace_rows, trace_cols = [], [], []
 
     for i, (df, title, column) in enumerate(args):
         if column not in df.columns:
@@ -406,20 +445,24 @@ def multi_distance_distribution_gen(conn,*args):
         r = (i // 2) + 1
         c = (i % 2) + 1
 
-        fig.add_trace(
-            go.Histogram(
-                x=df[column],
-                name=title,
-                opacity=0.75,
-                marker_color=colors[color_index % len(colors)],
-                nbinsx=30
-            ),
-            row=r,
-            col=c
-        )
+        # Bin the values here so only the 30 bar heights are sent to the browser
+        counts, edges = np.histogram(df[column].dropna().to_numpy(dtype=float), bins=30)
+
+        traces.append(go.Bar(
+            x=(edges[:-1] + edges[1:]) / 2,
+            y=counts,
+            name=title,
+            opacity=0.75,
+            marker_color=colors[color_index % len(colors)]
+        ))
+        trace_rows.append(r)
+        trace_cols.append(c)
 
         color_index += 1
 
+    # Add all histograms to their subplots at once
+    fig.add_traces(traces, rows=trace_rows, cols=trace_cols)
+
     fig.update_layout(
         title="Comparison of Distance Distributions",
         bargap=0.1,
@@ -428,7 +471,7 @@ def multi_distance_distribution_gen(conn,*args):
         height=rows * 400
     )
 
-    fig.show()
+    return fig
 
 def plot_wind_impact_vs_air_time(conn,impact_threshold=5):
     """
@@ -441,45 +484,43 @@ def plot_wind_impact_vs_air_time(conn,impact_threshold=5):
     Returns:
       tuple: (violin plot figure, correlation value)
     """
-    cursor = conn.cursor()
-    # Check if the flight_direction_map table exists
-    cursor.execute("SELECT name FROM sqlite_master WHERE type='table' AND name='flight_direction_map';")
-    if cursor.fetchone() is None:
-        print("flight_direction_map table not found. Creating it...")
-        create_flight_direction_mapping_table(conn)
+    ensure_flight_direction_mapping_table(conn)
     
-    # Query flights joined with weather and flight_direction_map
+    # Query flights joined with weather and flight_direction_map, only keeping
+    # the columns and rows that are needed to compute the wind impact
     query = """
-        SELECT f.flight, f.origin, f.dest, f.time_hour, f.air_time,
-               w.wind_dir, w.wind_speed, fdm.direction
+        SELECT f.air_time, w.wind_dir, w.wind_speed, fdm.direction
         FROM flights f
-        LEFT JOIN weather w 
+        JOIN weather w 
             ON f.origin = w.origin AND f.time_hour = w.time_hour
-        LEFT JOIN flight_direction_map fdm 
-            ON f.origin = fdm.origin AND f.dest = fdm.dest;
+        JOIN flight_direction_map fdm 
+            ON f.origin = fdm.origin AND f.dest = fdm.dest
+        WHERE f.air_time IS NOT NULL
+          AND w.wind_dir IS NOT NULL
+          AND w.wind_speed IS NOT NULL
+          AND fdm.direction IS NOT NULL;
     """
     df = pd.read_sql_query(query, conn)
     
     # Compute wind impact
-    df["wind_impact"] = df.apply(
-        lambda row: compute_wind_impact(row["direction"], row["wind_dir"], row["wind_speed"]),
-        axis=1
+    df["wind_impact"] = compute_wind_impact(
+        df["direction"].to_numpy(), df["wind_dir"].to_numpy(), df["wind_speed"].to_numpy()
     )
     
-    # Remove rows with missing air_time or wind_impact
-    df = df.dropna(subset=["air_time", "wind_impact"])
-    
-    # Classify wind type based on the wind impact
-    df["wind_type"] = np.where(df["wind_impact"] > impact_threshold, "Tailwind",
-                         np.where(df["wind_impact"] < -impact_threshold, "Headwind", "Crosswind"))
-    
-
-    correlation = np.corrcoef(df["wind_impact"], df["air_time"])[0, 1]
+    # Classify wind type based on the wind impact, stored as a categorical column:
+    # code 0 (Headwind) below -threshold, 2 (Tailwind) above threshold, 1 (Crosswind) otherwise
+    wind_impact = df["wind_impact"].to_numpy()
+    wind_type_codes = (1 + (wind_impact > impact_threshold).astype(np.int8)
+                         - (wind_impact < -impact_threshold).astype(np.int8))
+    df["wind_type"] = pd.Categorical.from_codes(wind_type_codes, categories=["Headwind", "Crosswind", "Tailwind"])
+
+    correlation = float(np.corrcoef(df["wind_impact"].to_numpy(), df["air_time"].to_numpy())[0, 1])
     
     # Create a violin plot of air_time by wind type
     fig = px.violin(df, x="wind_type", y="air_time", box=False, points=False,
                     title="Distribution of Air Time by Wind Type",
                     color="wind_type", 
+                    category_orders={"wind_type": ["Headwind", "Crosswind", "Tailwind"]},
                     color_discrete_map={"Headwind": "red", "Tailwind": "green", "Crosswind": "blue"})
     
     return fig, correlation  
@@ -507,36 +548,38 @@ def plot_avg_departure_delay(conn, month=None, day=None):
         >>> fig.show()
     """
     try:
-        cursor = conn.cursor()
-
-        # Base query and parameters list
+        # Average per carrier first (index-only on flights), then join the small
+        # aggregated result to the airlines table
         query = """
             SELECT airlines.name AS airline_name, 
-                   AVG(flights.dep_delay) AS avg_dep_delay 
-            FROM flights 
-            JOIN airlines ON flights.carrier = airlines.carrier 
+                   carrier_delays.avg_dep_delay 
+            FROM (
+                SELECT carrier, AVG(dep_delay) AS avg_dep_delay 
+                FROM flights 
         """
         params = []
 
         # If both month and day are provided, add filtering condition
         if month is not None and day is not None:
-            query += "WHERE flights.month = ? AND flights.day = ? "
+            query += "WHERE month = ? AND day = ? "
             params.extend([month, day])
 
-        query += "GROUP BY airlines.name"
+        query += """
+                GROUP BY carrier
+            ) AS carrier_delays
+            JOIN airlines ON carrier_delays.carrier = airlines.carrier
+            ORDER BY airlines.name
+        """
 
         # Execute the query
-        cursor.execute(query, tuple(params))
-        rows = cursor.fetchall()
+        df_delays = pd.read_sql_query(query, conn, params=tuple(params))
 
-        if not rows:
+        if df_delays.empty:
             raise ValueError("No flight delay data found for any airline")
 
-        df_delays = pd.DataFrame(rows, columns=["Airline", "Average departure delay"])
-
         fig = go.Figure(data=[go.Bar(
-            x=df_delays["Airline"],
-            y=df_delays["Average departure delay"],
+            x=df_delays["airline_name"].to_numpy(),
+            y=df_delays["avg_dep_delay"].to_numpy(),
             marker_color='skyblue'
         )])
 
@@ -562,7 +605,8 @@ def analyze_weather_effects_plots(conn):
     for different aircraft manufacturers.
 
     Parameters:
-        db_filename (str): Path to the SQLite database file. Defaults to 'flights_database.db'.
+        conn (sqlite3.Connection): Database connection object. The connection is left
+            open, so it can be reused by the caller.
 
     Returns:
         plotly.graph_objects.Figure: A grouped bar plot showing average delays by manufacturer
@@ -573,109 +617,80 @@ def analyze_weather_effects_plots(conn):
         ValueError: If no valid data is found after filtering.
         
     Example:
-        >>> fig = analyze_weather_effects_plots('my_flights.db')
+        >>> conn = sqlite3.connect('flights.db')
+        >>> fig = analyze_weather_effects_plots(conn)
         >>> fig.show()
     """
     try:
+        # --- Define Weather Conditions ---
+        # Define thresholds (adjust as needed)
+        thresholds = {
+            "strong_wind_threshold": 25,
+            "gustiness_threshold": 10,
+            "crosswind_threshold": 15,
+            "max_tailwind_component": 10,
+        }
+
+        # The crosswind component below needs sin() and radians() in SQL
+        ensure_math_functions(conn)
+
+        # Filtering, categorization and averaging all happen in SQLite so only the
+        # (manufacturer x weather condition) averages are loaded into pandas.
+        # The CASE branches are checked in order, the first one that matches wins.
         query = """
-        SELECT f.dep_delay, p.manufacturer, 
-               w.wind_speed, w.wind_dir, w.wind_gust, w.precip
-        FROM flights f
-        JOIN planes p ON f.tailnum = p.tailnum
-        JOIN weather w ON f.origin = w.origin 
-                     AND f.time_hour = w.time_hour
-        WHERE p.manufacturer IS NOT NULL
+        WITH weather_flights AS (
+            SELECT f.dep_delay, p.manufacturer,
+                   w.wind_speed, w.wind_dir, w.wind_gust, w.precip,
+                   w.wind_speed * abs(sin(radians(w.wind_dir))) AS crosswind_component
+            FROM flights f
+            JOIN planes p ON f.tailnum = p.tailnum
+            JOIN weather w ON f.origin = w.origin 
+                         AND f.time_hour = w.time_hour
+            WHERE p.manufacturer IS NOT NULL
+              AND f.dep_delay < 300   -- Remove delay outliers
+              AND f.dep_delay > -50   -- Remove early departures
+              AND w.wind_speed IS NOT NULL
+              AND w.wind_dir IS NOT NULL
+              AND w.wind_gust IS NOT NULL
+              AND w.precip IS NOT NULL
+        )
+        SELECT manufacturer,
+               CASE
+                   -- Good Weather: Low wind speed, low gustiness, no precipitation
+                   WHEN wind_speed <= 10 AND wind_gust - wind_speed <= 5 AND precip = 0
+                       THEN 'Good'
+                   -- Strong Headwind (within +/- 30 degrees of runway heading)
+                   WHEN (wind_dir >= 330 OR wind_dir <= 30) AND wind_speed > :strong_wind_threshold
+                       THEN 'Strong Headwind'
+                   -- Strong Tailwind (within +/- 30 degrees of runway heading + 180 degrees)
+                   WHEN wind_dir BETWEEN 150 AND 210 AND wind_speed > :max_tailwind_component
+                       THEN 'Strong Tailwind'
+                   WHEN crosswind_component > :crosswind_threshold
+                       THEN 'Strong Crosswind'
+                   WHEN wind_gust - wind_speed > :gustiness_threshold
+                       THEN 'High Gustiness'
+                   WHEN precip > 0
+                       THEN 'Precipitation'
+                   ELSE 'Moderate'
+               END AS weather_condition,
+               AVG(dep_delay) AS dep_delay,
+               MIN(wind_dir) AS min_wind_dir,
+               MAX(wind_dir) AS max_wind_dir
+        FROM weather_flights
+        GROUP BY manufacturer, weather_condition
+        ORDER BY manufacturer, weather_condition
         """
 
-        df = pd.read_sql_query(query, conn)
-        conn.close()
+        manufacturer_delay = pd.read_sql_query(query, conn, params=thresholds)
 
-        if df.empty:
-            raise ValueError("No valid data found in the database")
-
-        # Data Cleaning and Filtering
-        df = df[df['dep_delay'] < 300]  # Remove delay outliers
-        df = df[df['dep_delay'] > -50]  # Remove early departures
-        df = df.dropna(subset=['dep_delay', 'manufacturer', 'wind_speed', 
-                              'wind_dir', 'wind_gust', 'precip'])
-
-        if df.empty:
+        if manufacturer_delay.empty:
             raise ValueError("No valid data remains after filtering")
 
-        # --- Define Weather Conditions ---
-        # Define thresholds (adjust as needed)
-        strong_wind_threshold = 25
-        gustiness_threshold = 10
-        crosswind_threshold = 15
-        max_tailwind_component = 10
-
-        # Create a function to categorize wind conditions
-        def categorize_wind(row):
-            """
-            Categorizes weather conditions based on wind and precipitation data.
-
-            Parameters:
-                row (pd.Series): A pandas Series containing the following fields:
-                    - wind_speed: Wind speed in knots
-                    - wind_dir: Wind direction in degrees
-                    - wind_gust: Wind gust speed in knots
-                    - precip: Precipitation amount
-
-            Returns:
-                str: Weather condition category ('Good', 'Strong Headwind', 'Strong Tailwind',
-                     'Strong Crosswind', 'High Gustiness', 'Precipitation', or 'Moderate')
-
-            Raises:
-                KeyError: If any required field is missing from the input row
-                ValueError: If wind direction is not in valid range [0-360]
-            """
-            try:
-                wind_speed = row['wind_speed']
-                wind_dir = row['wind_dir']
-                wind_gust = row['wind_gust']
-                precip = row['precip']
-
-                # Validate wind direction
-                if not (0 <= wind_dir <= 360):
-                    raise ValueError(f"Wind direction must be between 0 and 360 degrees, got {wind_dir}")
-
-                # Good Weather: Low wind speed, low gustiness, no precipitation
-                if wind_speed <= 10 and wind_gust - wind_speed <= 5 and precip == 0:
-                    return 'Good'
-
-                # Problematic Conditions:
-                # Strong Headwind (within +/- 30 degrees of runway heading)
-                if (330 <= wind_dir <= 360 or 0 <= wind_dir <= 30) and wind_speed > strong_wind_threshold:
-                    return 'Strong Headwind'
-
-                # Strong Tailwind (within +/- 30 degrees of runway heading + 180 degrees)
-                if 150 <= wind_dir <= 210 and wind_speed > max_tailwind_component:
-                    return 'Strong Tailwind'
-
-                # Strong Crosswind
-                crosswind_component = wind_speed * abs(sin(radians(wind_dir)))
-                if crosswind_component > crosswind_threshold:
-                    return 'Strong Crosswind'
-
-                # High Gustiness
-                if wind_gust - wind_speed > gustiness_threshold:
-                    return 'High Gustiness'
-
-                # Precipitation
-                if precip > 0:
-                    return 'Precipitation'
-
-                return 'Moderate'
-
-            except KeyError as e:
-                raise KeyError(f"Missing required field in input row: {str(e)}")
-            except Exception as e:
-                raise Exception(f"Error categorizing wind conditions: {str(e)}")
-
-        df['weather_condition'] = df.apply(categorize_wind, axis=1)
-
-        # --- Calculate Average Delay per Manufacturer and Weather Condition ---
-        manufacturer_delay = df.groupby(['manufacturer', 'weather_condition'])['dep_delay'].mean().reset_index()
+        # Validate wind direction
+        invalid_dir = manufacturer_delay[(manufacturer_delay['min_wind_dir'] < 0) |
+                                         (manufacturer_delay['max_wind_dir'] > 360)]
+        if not invalid_dir.empty:
+            raise ValueError("Wind direction must be between 0 and 360 degrees")
 
         # --- Visualization: Grouped Bar Plot ---
         fig = px.bar(manufacturer_delay, x='manufacturer', y='dep_delay', color='weather_condition', barmode='group',
@@ -691,9 +706,10 @@ def analyze_weather_effects_plots(conn):
     except Exception as e:
         raise Exception(f"An error occurred while creating the plot: {str(e)}")
 
-def plot_avg_delay_by_hour(conn, month: int, day: int):
+def compute_hourly_stats(conn, month: int, day: int):
     """
-    Plots the average departure delay grouped by hour for a specific day.
+    Computes all hourly averages used by the plot_avg_*_by_hour functions for a specific
+    day in a single query instead of one query per plot.
 
     Parameters:
     conn (sqlite3.Connection): Database connection.
@@ -701,150 +717,148 @@ def plot_avg_delay_by_hour(conn, month: int, day: int):
     day (int): The specified day.
 
     Returns:
-    plotly.graph_objects.Figure: A bar plot showing the average departure delay by hour.
-    """
-    cursor = conn.cursor()
-
+    pandas.DataFrame: 24 rows (hour 0-23) with columns 'avg_delay', 'avg_visib',
+    'avg_wind_speed', 'avg_wind_gust' and 'avg_precip'. Hours without data are NaN.
+    """
+    # Hourly statistics are cached per connection and day together with the database
+    # version they were built from, so they are rebuilt once the database changes
+    cache = get_connection_cache(conn)
+    key = ("hourly_stats", month, day)
+    version = get_database_version(conn)
+    cached = cache.get(key)
+    if cached is not None and cached[0] == version:
+        return cached[1].copy()
+
+    # The recursive CTE generates the hours 0-23 so every hour is returned, even
+    # hours without flights or weather data (their averages are NULL).
+    # AVG skips NULL values, so every column is averaged over its own non-missing rows.
     query = """
-    SELECT strftime('%H', sched_dep_time ) AS hour, AVG(dep_delay) AS avg_delay
-    FROM flights
-    WHERE month = ? AND day = ? AND sched_dep_time  IS NOT NULL
-    GROUP BY hour
-    ORDER BY hour;
-    """
-    cursor.execute(query, (month, day))
-    result = cursor.fetchall()
-
-    if not result:
-        print("No data available for the specified day.")
-        return
-
-    df = pd.DataFrame(result, columns=['hour', 'avg_delay'])
-    df['hour'] = df['hour'].astype(int)
-
-    all_hours = pd.DataFrame({'hour': range(24)})
-    df = pd.merge(all_hours, df, on='hour', how='left').fillna(0)
-
-    fig = px.bar(
-        df,
-        x='hour',
-        y='avg_delay',
-        title=f"Average Departure Delay by Hour on {month}/{day}",
-        labels={'hour': 'Hour of the Day (24-Hour Format)', 'avg_delay': 'Average Delay (Minutes)'},
-        color='avg_delay',
-        color_continuous_scale='Blues'
-    )
-    fig.update_layout(
-        xaxis=dict(tickmode='linear', dtick=1),
-        yaxis=dict(title='Average Delay (Minutes)'),
-        bargap=0.2
+    WITH RECURSIVE hours(hour) AS (
+        VALUES (0)
+        UNION ALL
+        SELECT hour + 1 FROM hours WHERE hour < 23
+    ),
+    hourly_delays AS (
+        SELECT CAST(strftime('%H', sched_dep_time) AS INTEGER) AS hour, AVG(dep_delay) AS avg_delay
+        FROM flights
+        WHERE month = :month AND day = :day AND sched_dep_time IS NOT NULL
+        GROUP BY 1
+    ),
+    hourly_weather AS (
+        SELECT hour,
+               AVG(visib) AS avg_visib,
+               AVG(wind_speed) AS avg_wind_speed,
+               AVG(wind_gust) AS avg_wind_gust,
+               AVG(precip) AS avg_precip
+        FROM weather
+        WHERE month = :month AND day = :day
+        GROUP BY hour
     )
+    SELECT hours.hour, d.avg_delay, w.avg_visib, w.avg_wind_speed, w.avg_wind_gust, w.avg_precip
+    FROM hours
+    LEFT JOIN hourly_delays d ON d.hour = hours.hour
+    LEFT JOIN hourly_weather w ON w.hour = hours.hour
+    ORDER BY hours.hour;
+    """
+    value_columns = ['avg_delay', 'avg_visib', 'avg_wind_speed', 'avg_wind_gust', 'avg_precip']
+    hourly_stats = pd.read_sql_query(query, conn, params={'month': month, 'day': day},
+                                     dtype={column: 'float64' for column in value_columns})
 
-    return fig
+    cache[key] = (version, hourly_stats.copy())
+    return hourly_stats
 
-def plot_avg_visibility_by_hour(conn, month: int, day: int):
+def plot_hourly_stat(conn, month: int, day: int, column: str, title: str, axis_label: str, hourly_stats=None):
     """
-    Plots the average visibility (visib) grouped by hour for a specific day.
+    Plots one column of compute_hourly_stats as a bar plot per hour for a specific day.
 
     Parameters:
     conn (sqlite3.Connection): Database connection.
     month (int): The specified month.
     day (int): The specified day.
+    column (str): Column of the hourly statistics to plot (e.g. 'avg_visib').
+    title (str): Name of the statistic used in the title (e.g. 'Average Visibility').
+    axis_label (str): Label of the y-axis, including the unit.
+    hourly_stats (pandas.DataFrame, optional): Result of compute_hourly_stats for this day.
+        Pass it when plotting several statistics to avoid querying the database again.
 
     Returns:
-    plotly.graph_objects.Figure: A bar plot showing the average visibility by hour.
-    """
-    cursor = conn.cursor()
-
-    query = """
-    SELECT hour, AVG(visib) AS avg_visib
-    FROM weather
-    WHERE month = ? AND day = ? AND visib IS NOT NULL
-    GROUP BY hour
-    ORDER BY hour;
+    plotly.graph_objects.Figure: A bar plot of the statistic by hour, or None if there is no data.
     """
-    cursor.execute(query, (month, day))
-    result = cursor.fetchall()
+    if hourly_stats is None:
+        hourly_stats = compute_hourly_stats(conn, month, day)
 
-    if not result:
+    if hourly_stats[column].isna().all():
         print("No data available for the specified day.")
         return
 
-    df = pd.DataFrame(result, columns=['hour', 'avg_visib'])
-    df['hour'] = df['hour'].astype(int)
-
-    all_hours = pd.DataFrame({'hour': range(24)})
-    df = pd.merge(all_hours, df, on='hour', how='left').fillna(0)
+    df = hourly_stats[['hour', column]].fillna(0)
 
     fig = px.bar(
         df,
         x='hour',
-        y='avg_visib',
-        title=f"Average Visibility by Hour on {month}/{day}",
-        labels={'hour': 'Hour of the Day (24-Hour Format)', 'avg_visib': 'Average Visibility (Miles)'},
-        color='avg_visib',
+        y=column,
+        title=f"{title} by Hour on {month}/{day}",
+        labels={'hour': 'Hour of the Day (24-Hour Format)', column: axis_label},
+        color=column,
         color_continuous_scale='Blues'
     )
     fig.update_layout(
         xaxis=dict(tickmode='linear', dtick=1),
-        yaxis=dict(title='Average Visibility (Miles)'),
+        yaxis=dict(title=axis_label),
         bargap=0.2
     )
 
     return fig
 
-def plot_avg_wind_speed_by_hour(conn, month: int, day: int):
+def plot_avg_delay_by_hour(conn, month: int, day: int, hourly_stats=None):
     """
-    Plots the average wind speed grouped by hour for a specific day.
+    Plots the average departure delay grouped by hour for a specific day.
 
     Parameters:
     conn (sqlite3.Connection): Database connection.
     month (int): The specified month.
     day (int): The specified day.
+    hourly_stats (pandas.DataFrame, optional): Precomputed result of compute_hourly_stats.
 
     Returns:
-    plotly.graph_objects.Figure: A bar plot showing the average wind speed by hour.
+    plotly.graph_objects.Figure: A bar plot showing the average departure delay by hour.
     """
-    cursor = conn.cursor()
+    return plot_hourly_stat(conn, month, day, 'avg_delay', "Average Departure Delay",
+                            'Average Delay (Minutes)', hourly_stats)
 
-    query = """
-    SELECT hour, AVG(wind_speed) AS avg_wind_speed
-    FROM weather
-    WHERE month = ? AND day = ? AND wind_speed IS NOT NULL
-    GROUP BY hour
-    ORDER BY hour;
+def plot_avg_visibility_by_hour(conn, month: int, day: int, hourly_stats=None):
     """
-    cursor.execute(query, (month, day))
-    result = cursor.fetchall()
+    Plots the average visibility (visib) grouped by hour for a specific day.
 
-    if not result:
-        print("No data available for the specified day.")
-        return
+    Parameters:
+    conn (sqlite3.Connection): Database connection.
+    month (int): The specified month.
+    day (int): The specified day.
+    hourly_stats (pandas.DataFrame, optional): Precomputed result of compute_hourly_stats.
 
-    df = pd.DataFrame(result, columns=['hour', 'avg_wind_speed'])
-    df['hour'] = df['hour'].astype(int)
+    Returns:
+    plotly.graph_objects.Figure: A bar plot showing the average visibility by hour.
+    """
+    return plot_hourly_stat(conn, month, day, 'avg_visib', "Average Visibility",
+                            'Average Visibility (Miles)', hourly_stats)
 
-    all_hours = pd.DataFrame({'hour': range(24)})
-    df = pd.merge(all_hours, df, on='hour', how='left').fillna(0)
+def plot_avg_wind_speed_by_hour(conn, month: int, day: int, hourly_stats=None):
+    """
+    Plots the average wind speed grouped by hour for a specific day.
 
-    fig = px.bar(
-        df,
-        x='hour',
-        y='avg_wind_speed',
-        title=f"Average Wind Speed by Hour on {month}/{day}",
-        labels={'hour': 'Hour of the Day (24-Hour Format)', 'avg_wind_speed': 'Average Wind Speed (Knots)'},
-        color='avg_wind_speed',
-        color_continuous_scale='Blues'
-    )
-    fig.update_layout(
-        xaxis=dict(tickmode='linear', dtick=1),
-        yaxis=dict(title='Average Wind Speed (Knots)'),
-        bargap=0.2
-    )
+    Parameters:
+    conn (sqlite3.Connection): Database connection.
+    month (int): The specified month.
+    day (int): The specified day.
+    hourly_stats (pandas.DataFrame, optional): Precomputed result of compute_hourly_stats.
 
-    return fig
+    Returns:
+    plotly.graph_objects.Figure: A bar plot showing the average wind speed by hour.
+    """
+    return plot_hourly_stat(conn, month, day, 'avg_wind_speed', "Average Wind Speed",
+                            'Average Wind Speed (Knots)', hourly_stats)
 
-def plot_avg_wind_gust_by_hour(conn, month: int, day: int):
+def plot_avg_wind_gust_by_hour(conn, month: int, day: int, hourly_stats=None):
     """
     Plots the average wind gust grouped by hour for a specific day.
 
@@ -852,50 +866,15 @@ def plot_avg_wind_gust_by_hour(conn, month: int, day: int):
     conn (sqlite3.Connection): Database connection.
     month (int): The specified month.
     day (int): The specified day.
+    hourly_stats (pandas.DataFrame, optional): Precomputed result of compute_hourly_stats.
 
     Returns:
     plotly.graph_objects.Figure: A bar plot showing the average wind gust by hour.
     """
-    cursor = conn.cursor()
-
-    query = """
-    SELECT hour, AVG(wind_gust) AS avg_wind_gust
-    FROM weather
-    WHERE month = ? AND day = ? AND wind_gust IS NOT NULL
-    GROUP BY hour
-    ORDER BY hour;
-    """
-    cursor.execute(query, (month, day))
-    result = cursor.fetchall()
-
-    if not result:
-        print("No data available for the specified day.")
-        return
-
-    df = pd.DataFrame(result, columns=['hour', 'avg_wind_gust'])
-    df['hour'] = df['hour'].astype(int)
-
-    all_hours = pd.DataFrame({'hour': range(24)})
-    df = pd.merge(all_hours, df, on='hour', how='left').fillna(0)
-
-    fig = px.bar(
-        df,
-        x='hour',
-        y='avg_wind_gust',
-        title=f"Average Wind Gust by Hour on {month}/{day}",
-        labels={'hour': 'Hour of the Day (24-Hour Format)', 'avg_wind_gust': 'Average Wind Gust (Knots)'},
-        color='avg_wind_gust',
-        color_continuous_scale='Blues'
-    )
-    fig.update_layout(
-        xaxis=dict(tickmode='linear', dtick=1),
-        yaxis=dict(title='Average Wind Gust (Knots)'),
-        bargap=0.2
-    )
-
-    return fig
+    return plot_hourly_stat(conn, month, day, 'avg_wind_gust', "Average Wind Gust",
+                            'Average Wind Gust (Knots)', hourly_stats)
 
-def plot_avg_precip_by_hour(conn, month: int, day: int):
+def plot_avg_precip_by_hour(conn, month: int, day: int, hourly_stats=None):
     """
     Plots the average precipitation grouped by hour for a specific day.
 
@@ -903,48 +882,13 @@ def plot_avg_precip_by_hour(conn, month: int, day: int):
     conn (sqlite3.Connection): Database connection.
     month (int): The specified month.
     day (int): The specified day.
+    hourly_stats (pandas.DataFrame, optional): Precomputed result of compute_hourly_stats.
 
     Returns:
     plotly.graph_objects.Figure: A bar plot showing the average precipitation by hour.
     """
-    cursor = conn.cursor()
-
-    query = """
-    SELECT hour, AVG(precip) AS avg_precip
-    FROM weather
-    WHERE month = ? AND day = ? AND precip IS NOT NULL
-    GROUP BY hour
-    ORDER BY hour;
-    """
-    cursor.execute(query, (month, day))
-    result = cursor.fetchall()
-
-    if not result:
-        print("No data available for the specified day.")
-        return
-
-    df = pd.DataFrame(result, columns=['hour', 'avg_precip'])
-    df['hour'] = df['hour'].astype(int)
-
-    all_hours = pd.DataFrame({'hour': range(24)})
-    df = pd.merge(all_hours, df, on='hour', how='left').fillna(0)
-
-    fig = px.bar(
-        df,
-        x='hour',
-        y='avg_precip',
-        title=f"Average Precipitation by Hour on {month}/{day}",
-        labels={'hour': 'Hour of the Day (24-Hour Format)', 'avg_precip': 'Average Precipitation (Inches)'},
-        color='avg_precip',
-        color_continuous_scale='Blues'
-    )
-    fig.update_layout(
-        xaxis=dict(tickmode='linear', dtick=1),
-        yaxis=dict(title='Average Precipitation (Inches)'),
-        bargap=0.2
-    )
-
-    return fig
+    return plot_hourly_stat(conn, month, day, 'avg_precip', "Average Precipitation",
+                            'Average Precipitation (Inches)', hourly_stats)
 
 def plot_wind_direction(direction, wind_speed=1):
     """
@@ -967,10 +911,8 @@ def plot_wind_direction(direction, wind_speed=1):
     x_end = np.cos(angle_rad) * wind_speed  # Projection on X
     y_end = np.sin(angle_rad) * wind_speed  # Projection on Y
 
-    fig = go.Figure()
-
     # Draw the circular axis
-    fig.add_trace(go.Scatterpolar(
+    fig = go.Figure(go.Scatterpolar(
         r=[0, wind_speed],  # Start from the center
         theta=[direction, direction],
         mode="lines",
@@ -1003,22 +945,23 @@ def plot_avg_wind_speed_for_route(conn, origin, destination):
         plotly.graph_objs._figure.Figure or None: A Plotly figure showing wind trends, or None if no data.
     """
     query = """
-        SELECT strftime('%Y-%m', f.sched_dep_time) AS month, AVG(w.wind_speed) AS avg_wind_speed
-        FROM flights f
-        JOIN weather w ON f.origin = w.origin AND f.time_hour = w.time_hour
-        WHERE f.origin = ? AND f.dest = ?
-        GROUP BY strftime('%Y-%m', f.sched_dep_time)
-        ORDER BY strftime('%Y-%m', f.sched_dep_time)
+        SELECT month, AVG(wind_speed) AS avg_wind_speed
+        FROM (
+            SELECT strftime('%Y-%m-01', f.sched_dep_time) AS month, w.wind_speed
+            FROM flights f
+            JOIN weather w ON f.origin = w.origin AND f.time_hour = w.time_hour
+            WHERE f.origin = ? AND f.dest = ?
+        )
+        GROUP BY month
+        ORDER BY month
     """
-    df = pd.read_sql_query(query, conn, params=(origin, destination))
+    df = pd.read_sql_query(query, conn, params=(origin, destination),
+                           parse_dates={"month": {"format": "%Y-%m-%d"}})
 
     # Check if there is valid data
     if df.empty or df['avg_wind_speed'].isnull().all():
         return None
 
-    # Convert to datetime if not already
-    df['month'] = pd.to_datetime(df['month'])
-
     # Create the bar graph
     fig = px.bar(
         df,